@@ -28,6 +28,13 @@ db_name = "dev" if dev else "prod"
 root = Tk()
 root.withdraw()  # Hide the main window
 
+# Create or migrate the table before it is queried or written to
+try:
+    Database().ensure_table(db_name, sensors)
+except Exception as e:
+    messagebox.showerror("Error", f"Table setup unsuccessful: {e}")  # Show an error message
+    exit(1)  # Exit the program
+
 # Show a file selection dialog
 root.filename = filedialog.askopenfilename(
     initialdir=OneDriveFolder,
@@ -0,0 +1,140 @@
+# default python imports
+import json
+import time
+import uuid
+
+# data imports
+import numpy as np
+import pandas as pd
+from questdb.ingress import Sender
+
+# utils code imports
+from utils.dbconnector import Database, SYMBOL_COLUMNS, TIMESTAMP_COLUMN
+
+# Local QuestDB stand-in, e.g. started with:
+# docker run -p 9000:9000 -p 9009:9009 questdb/questdb
+local_settings = {"host": "localhost", "port": 9009, "port_web": 9000}
+
+# Size of the generated benchmark data
+n_files = 50
+n_rows_per_file = 20_000
+n_queries = 20
+
+# Load sensor list from the configuration file
+with open("config.json", "r") as f:
+    sensors = json.load(f)["sensors"]
+
+
+def make_data():
+    """
+    Generates a DataFrame shaped like the output of File.get_data
+
+    Returns:
+        pandas.DataFrame: Dataframe with the generated data
+    """
+    rng = np.random.default_rng(0)
+    frames = []
+    for i in range(n_files):
+        # 100Hz measurements, one file after another
+        frame = pd.DataFrame(
+            rng.standard_normal((n_rows_per_file, len(sensors))).astype(np.float32),
+            columns=sensors,
+        )
+        frame[TIMESTAMP_COLUMN] = pd.date_range(
+            pd.Timestamp("2023-03-01") + pd.Timedelta(hours=i), periods=n_rows_per_file, freq="10ms"
+        )
+        frame["filename"] = f"file_{i}"
+        frame["person"] = f"person_{i % 5}"
+        frame["activity"] = f"activity_{i % 6}"
+        frame["hash"] = uuid.uuid4().hex
+        frames.append(frame)
+    return pd.concat(frames, ignore_index=True)
+
+
+def wait_for_rows(db, table, n_rows, timeout=120):
+    """
+    Waits until all rows are visible, WAL tables apply writes asynchronously
+
+    Args:
+        db (Database): Database to query
+        table (str): Name of the table
+        n_rows (int): Expected number of rows
+        timeout (int): Seconds to wait at most
+    """
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        if db.execute(f"SELECT count() FROM {table}")["dataset"][0][0] >= n_rows:
+            return
+        time.sleep(0.1)
+    raise TimeoutError(f"{table} did not reach {n_rows} rows")
+
+
+def ingest(db, table, data, typed):
+    """
+    Writes the data to a table and returns the ingest rate
+
+    Args:
+        db (Database): Database to write to
+        table (str): Name of the table
+        data (pandas.DataFrame): Dataframe with the data
+        typed (bool): Use the provisioned schema instead of ILP auto-creation
+
+    Returns:
+        rate (float): Rows per second until all rows are visible
+    """
+    db.execute(f"DROP TABLE IF EXISTS {table}")
+    if typed:
+        # provision outside of the timer, only ingest is compared
+        db.ensure_table(table, sensors)
+    start = time.perf_counter()
+    with Sender(local_settings["host"], local_settings["port"]) as sender:
+        if typed:
+            sender.dataframe(df=data, table_name=table, symbols=list(SYMBOL_COLUMNS), at=TIMESTAMP_COLUMN)
+        else:
+            # previous behaviour: strings for metadata and timestamp as unix int
+            legacy = data.copy()
+            legacy[TIMESTAMP_COLUMN] = (legacy[TIMESTAMP_COLUMN] - pd.Timestamp("1970-01-01")) // pd.Timedelta("1ns")
+            sender.dataframe(df=legacy, table_name=table)
+    wait_for_rows(db, table, len(data))
+    return len(data) / (time.perf_counter() - start)
+
+
+def query_latency(db, table):
+    """
+    Runs the filter queries used by the app and returns the median latency per filter
+
+    Args:
+        db (Database): Database to query
+        table (str): Name of the table
+
+    Returns:
+        latencies (dict): Filter -> median latency in milliseconds
+    """
+    filters = {
+        "person": "person = 'person_1'",
+        "activity": "activity = 'activity_2'",
+        "filename": "filename = 'file_7'",
+        "app check": "filename = 'file_7' and person = 'person_2' and activity = 'activity_1'",
+    }
+    latencies = {}
+    for name, condition in filters.items():
+        timings = []
+        for _ in range(n_queries):
+            start = time.perf_counter()
+            db.execute(f"SELECT count() FROM {table} WHERE {condition}")
+            timings.append((time.perf_counter() - start) * 1000)
+        latencies[name] = float(np.median(timings))
+    return latencies
+
+
+if __name__ == "__main__":
+    db = Database(local_settings)
+    data = make_data()
+    print(db.execute("SELECT build()")["dataset"][0][0])
+    print(f"{len(data)} rows, {len(sensors)} sensors")
+
+    for table, typed in (("bench_legacy", False), ("bench_typed", True)):
+        rate = ingest(db, table, data, typed)
+        print(f"\n{table}: {rate:,.0f} rows/s ingest")
+        for name, latency in query_latency(db, table).items():
+            print(f"  {name:<10} {latency:8.2f} ms")
@@ -0,0 +1,140 @@
+import pandas as pd
+import pytest
+
+from utils.dbconnector import Database
+
+sensors = ["Accelerometer_x", "Accelerometer_y"]
+
+
+def make_frame():
+    """
+    Returns a DataFrame shaped like the one write_data sends
+    """
+    return pd.DataFrame(
+        {
+            "timestamp": pd.date_range("2023-03-01", periods=3, freq="10ms"),
+            "Accelerometer_x": pd.Series([0.1, 0.2, 0.3], dtype="float32"),
+            "filename": "file",
+            "person": "person",
+            "activity": "activity",
+            "hash": "abc",
+        }
+    )
+
+
+def stub_execute(db, responses):
+    """
+    Replaces Database.execute, answers queries starting with a key of responses
+    and records all queries sent
+    """
+    queries = []
+
+    def execute(query):
+        queries.append(query)
+        for prefix, dataset in responses.items():
+            if query.startswith(prefix):
+                return {"dataset": dataset}
+        return {"ddl": "OK"}
+
+    db.execute = execute
+    return queries
+
+
+def test_validate_frame_accepts_valid_frame():
+    Database.validate_frame(make_frame(), sensors)
+
+
+def test_validate_frame_missing_column():
+    with pytest.raises(ValueError, match="Missing columns"):
+        Database.validate_frame(make_frame().drop(columns="person"), sensors)
+
+
+def test_validate_frame_unknown_column():
+    data = make_frame()
+    data["Gravity_x"] = 1.0
+    with pytest.raises(ValueError, match="not in table schema"):
+        Database.validate_frame(data, sensors)
+
+
+def test_validate_frame_timestamp_not_datetime():
+    data = make_frame()
+    data["timestamp"] = data["timestamp"].astype("int64")
+    with pytest.raises(ValueError, match="timestamp must be datetime64"):
+        Database.validate_frame(data, sensors)
+
+
+def test_validate_frame_symbol_not_str():
+    data = make_frame()
+    data["person"] = 1
+    with pytest.raises(ValueError, match="person must be str"):
+        Database.validate_frame(data, sensors)
+
+
+def test_validate_frame_sensor_not_float():
+    data = make_frame()
+    data["Accelerometer_x"] = 1
+    with pytest.raises(ValueError, match="Accelerometer_x must be float"):
+        Database.validate_frame(data, sensors)
+
+
+def test_ensure_table_creates_table():
+    db = Database()
+    queries = stub_execute(db, {"SELECT designatedTimestamp": []})
+
+    db.ensure_table("dev", sensors)
+
+    assert queries[1] == (
+        "CREATE TABLE IF NOT EXISTS dev ("
+        "filename SYMBOL CAPACITY 4096 INDEX, "
+        "person SYMBOL CAPACITY 256 INDEX, "
+        "activity SYMBOL CAPACITY 256 INDEX, "
+        "hash SYMBOL CAPACITY 4096, "
+        "Accelerometer_x DOUBLE, "
+        "Accelerometer_y DOUBLE, "
+        "timestamp TIMESTAMP) "
+        "TIMESTAMP(timestamp) PARTITION BY DAY WAL "
+        "DEDUP UPSERT KEYS(timestamp, filename, person, activity)"
+    )
+
+
+def test_ensure_table_migrates_table():
+    db = Database()
+    queries = stub_execute(
+        db,
+        {
+            "SELECT designatedTimestamp": [["timestamp", "DAY", True]],
+            "SELECT \"column\"": [
+                ["filename", "STRING", False],
+                ["person", "SYMBOL", True],
+                ["activity", "SYMBOL", False],
+                ["Accelerometer_x", "DOUBLE", False],
+                ["timestamp", "TIMESTAMP", False],
+            ],
+        },
+    )
+
+    db.ensure_table("dev", sensors)
+
+    assert queries[2:] == [
+        "ALTER TABLE dev ALTER COLUMN filename TYPE SYMBOL CAPACITY 4096",
+        "ALTER TABLE dev ALTER COLUMN filename ADD INDEX",
+        "ALTER TABLE dev ALTER COLUMN activity ADD INDEX",
+        "ALTER TABLE dev ADD COLUMN hash SYMBOL CAPACITY 4096",
+        "ALTER TABLE dev ADD COLUMN Accelerometer_y DOUBLE",
+        "ALTER TABLE dev DEDUP ENABLE UPSERT KEYS(timestamp, filename, person, activity)",
+    ]
+
+
+def test_ensure_table_rejects_auto_created_table():
+    db = Database()
+    queries = stub_execute(
+        db,
+        {
+            "SELECT designatedTimestamp": [["timestamp", "NONE", False]],
+            "SELECT \"column\"": [["timestamp", "LONG", False], ["Accelerometer_x", "FLOAT", False]],
+        },
+    )
+
+    with pytest.raises(RuntimeError, match="has to be recreated"):
+        db.ensure_table("dev", sensors)
+    assert not any(query.startswith("ALTER") for query in queries)
@@ -1,14 +1,23 @@
-import io
 import json
 import requests
 
-import polars as pl
-
 # Load database configuration
 with open("config.json") as f:
     config = json.load(f)
 questdb_settings = config["questdb"]  # Extract QuestDB settings from the loaded configuration
 
+# Table layout shared by table provisioning and ingest
+TIMESTAMP_COLUMN = "timestamp"  # designated timestamp
+SYMBOL_COLUMNS = {  # metadata columns stored as SYMBOL: column -> (capacity, indexed)
+    "filename": (4096, True),
+    "person": (256, True),
+    "activity": (256, True),
+    "hash": (4096, False),
+}
+PARTITION_BY = "DAY"
+# a measurement is identified by its time and file, so re-importing a file upserts instead of appending
+DEDUP_KEYS = [TIMESTAMP_COLUMN, "filename", "person", "activity"]
+
 class Database:
     """
     A class to interact with a database.
@@ -17,19 +26,33 @@ class Database:
 
     Attributes
     ----------
-    None
+    settings : dict
+        QuestDB connection settings (host, port, port_web).
 
     Methods
     -------
     get_scalar(query:str) -> float:
         Execute a query and return a scalar.
+    execute(query:str) -> dict:
+        Execute a query and return the parsed response.
+    get_table(table:str) -> dict:
+        Return the layout of a table.
+    get_columns(table:str) -> dict:
+        Return the column types and indexes of a table.
+    ensure_table(table:str, sensors:list) -> None:
+        Create or migrate a table to the expected schema.
+    validate_frame(data:pandas.DataFrame, sensors:list) -> None:
+        Check that a DataFrame matches the table schema.
     """
 
-    def __init__(self):
+    def __init__(self, settings=None):
         """
         Constructs all the necessary attributes for the Database object.
+
+        Args:
+            settings (dict): QuestDB settings, defaults to the ones in config.json.
         """
-        pass
+        self.settings = settings if settings is not None else questdb_settings
 
     def get_scalar(self, query: str) -> float:
         """
@@ -42,10 +65,170 @@ class Database:
             scalar (float): Scalar result of the query.
         """
         # Prepare the URL for the HTTP request by concatenating the host, port, and query parameters
-        url = f"http://{questdb_settings['host']}:{questdb_settings['port_web']}/exec?query={query}"
+        url = f"http://{self.settings['host']}:{self.settings['port_web']}/exec?query={query}"
 
         # Send an HTTP GET request to the specified URL
         r = requests.get(url)
 
         # Parse the response text as JSON and extract the scalar result
         return json.loads(r.text)["dataset"][0][0]
+
+    def execute(self, query: str) -> dict:
+        """
+        Execute a SQL query (DDL or SELECT) and return the parsed response.
+
+        Args:
+            query (str): SQL query to execute.
+
+        Returns:
+            response (dict): Parsed JSON response of the query.
+
+        Raises:
+            RuntimeError: If QuestDB rejects the query.
+        """
+        # let requests take care of url encoding the query
+        url = f"http://{self.settings['host']}:{self.settings['port_web']}/exec"
+        r = requests.get(url, params={"query": query})
+
+        # QuestDB reports errors in the response body
+        response = json.loads(r.text)
+        if "error" in response:
+            raise RuntimeError(f"QuestDB error for '{query}': {response['error']}")
+        return response
+
+    def get_table(self, table: str) -> dict:
+        """
+        Return the layout of a table.
+
+        Args:
+            table (str): Name of the table.
+
+        Returns:
+            layout (dict): designatedTimestamp, partitionBy and walEnabled of the table,
+                None if the table does not exist.
+        """
+        response = self.execute(
+            f"SELECT designatedTimestamp, partitionBy, walEnabled FROM tables() WHERE table_name = '{table}'"
+        )
+        if not response["dataset"]:
+            return None
+        return dict(zip(["designatedTimestamp", "partitionBy", "walEnabled"], response["dataset"][0]))
+
+    def get_columns(self, table: str) -> dict:
+        """
+        Return the column types and indexes of a table.
+
+        Args:
+            table (str): Name of the table, must exist.
+
+        Returns:
+            columns (dict): Column name -> (QuestDB type, indexed).
+        """
+        response = self.execute(f"SELECT \"column\", type, indexed FROM table_columns('{table}')")
+        return {name: (col_type, indexed) for name, col_type, indexed in response["dataset"]}
+
+    def ensure_table(self, table: str, sensors: list) -> None:
+        """
+        Create the table with SYMBOL metadata, a designated timestamp, time
+        partitioning and deduplication, or migrate an existing table towards it.
+
+        Args:
+            table (str): Name of the table.
+            sensors (list): Sensor columns stored as DOUBLE.
+
+        Raises:
+            RuntimeError: If an existing table cannot be migrated and has to be recreated.
+        """
+        layout = self.get_table(table)
+
+        # create the table if it does not exist
+        if layout is None:
+            definitions = [
+                f"{name} SYMBOL CAPACITY {capacity}" + (" INDEX" if indexed else "")
+                for name, (capacity, indexed) in SYMBOL_COLUMNS.items()
+            ]
+            definitions += [f"{sensor} DOUBLE" for sensor in sensors]
+            definitions.append(f"{TIMESTAMP_COLUMN} TIMESTAMP")
+            self.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(definitions)}) "
+                f"TIMESTAMP({TIMESTAMP_COLUMN}) PARTITION BY {PARTITION_BY} WAL "
+                f"DEDUP UPSERT KEYS({', '.join(DEDUP_KEYS)})"
+            )
+            return
+
+        columns = self.get_columns(table)
+
+        # designated timestamp, partitioning and WAL are fixed at creation
+        problems = []
+        if layout["designatedTimestamp"] != TIMESTAMP_COLUMN:
+            problems.append(f"designated timestamp is {layout['designatedTimestamp']}, not {TIMESTAMP_COLUMN}")
+        if layout["partitionBy"] != PARTITION_BY:
+            problems.append(f"partitioned by {layout['partitionBy']}, not {PARTITION_BY}")
+        if not layout["walEnabled"]:
+            problems.append("not a WAL table")
+
+        # existing columns must have a type that can be kept or converted
+        for name in SYMBOL_COLUMNS:
+            if name in columns and columns[name][0] not in ("SYMBOL", "STRING", "VARCHAR"):
+                problems.append(f"{name} is {columns[name][0]}, not SYMBOL")
+        for sensor in sensors:
+            if sensor in columns and columns[sensor][0] != "DOUBLE":
+                problems.append(f"{sensor} is {columns[sensor][0]}, not DOUBLE")
+
+        if problems:
+            raise RuntimeError(
+                f"Table {table} has to be recreated ({'; '.join(problems)}). "
+                f"Copy it over with e.g. CREATE TABLE {table}_new AS (SELECT ... FROM {table}) "
+                f"TIMESTAMP({TIMESTAMP_COLUMN}) PARTITION BY {PARTITION_BY} WAL"
+            )
+
+        # migrate metadata columns to (indexed) SYMBOL
+        for name, (capacity, indexed) in SYMBOL_COLUMNS.items():
+            if name not in columns:
+                self.execute(
+                    f"ALTER TABLE {table} ADD COLUMN {name} SYMBOL CAPACITY {capacity}" + (" INDEX" if indexed else "")
+                )
+                continue
+            if columns[name][0] != "SYMBOL":
+                self.execute(f"ALTER TABLE {table} ALTER COLUMN {name} TYPE SYMBOL CAPACITY {capacity}")
+            if indexed and not columns[name][1]:
+                self.execute(f"ALTER TABLE {table} ALTER COLUMN {name} ADD INDEX")
+
+        # add sensors that were not part of the table yet
+        for sensor in sensors:
+            if sensor not in columns:
+                self.execute(f"ALTER TABLE {table} ADD COLUMN {sensor} DOUBLE")
+
+        self.execute(f"ALTER TABLE {table} DEDUP ENABLE UPSERT KEYS({', '.join(DEDUP_KEYS)})")
+
+    @staticmethod
+    def validate_frame(data, sensors: list) -> None:
+        """
+        Check that a DataFrame matches the table schema before it is sent.
+
+        Args:
+            data (pandas.DataFrame): Dataframe to write, with a timestamp column.
+            sensors (list): Sensor columns allowed in the table.
+
+        Raises:
+            ValueError: If a column is missing, unknown or has the wrong type.
+        """
+        # metadata and the designated timestamp are required
+        missing = [col for col in [*SYMBOL_COLUMNS, TIMESTAMP_COLUMN] if col not in data.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {missing}")
+
+        # only known sensors may be written, absent sensors are stored as NULL
+        unknown = [col for col in data.columns if col not in [*SYMBOL_COLUMNS, TIMESTAMP_COLUMN, *sensors]]
+        if unknown:
+            raise ValueError(f"Columns not in table schema: {unknown}")
+
+        # check the types of the columns
+        if not str(data[TIMESTAMP_COLUMN].dtype).startswith("datetime64"):
+            raise ValueError(f"Column {TIMESTAMP_COLUMN} must be datetime64, got {data[TIMESTAMP_COLUMN].dtype}")
+        for col in SYMBOL_COLUMNS:
+            if data[col].dtype.kind not in "OU" and str(data[col].dtype) not in ("string", "category"):
+                raise ValueError(f"Column {col} must be str, got {data[col].dtype}")
+        for col in data.columns:
+            if col in sensors and data[col].dtype.kind != "f":
+                raise ValueError(f"Column {col} must be float, got {data[col].dtype}")
@@ -6,6 +6,8 @@ import pandas as pd
 from zipfile import ZipFile
 from questdb.ingress import Sender
 
+from utils.dbconnector import Database, SYMBOL_COLUMNS, TIMESTAMP_COLUMN
+
 
 class File:
     """
@@ -200,15 +202,21 @@ class File:
             data["hash"] = uuid.uuid4().hex
 
             # rename time to timestamp
-            data = data.rename(columns={"time": "timestamp"})
+            data = data.rename(columns={"time": TIMESTAMP_COLUMN})
 
-            # convert timestamp to unix int
-            data["timestamp"] = (data["timestamp"] - pd.Timestamp("1970-01-01")) // pd.Timedelta('1ns')
+            # check that the data matches the table schema
+            Database.validate_frame(data, self.sensors)
 
             # write data to database
             with Sender(questdb_settings["host"], questdb_settings["port"]) as sender:
                 # note: polars DataFrame needs to be converted to pandas DataFrame
-                sender.dataframe(df=data, table_name=table)
+                # metadata is sent as symbols and timestamp as designated timestamp
+                sender.dataframe(
+                    df=data,
+                    table_name=table,
+                    symbols=list(SYMBOL_COLUMNS),
+                    at=TIMESTAMP_COLUMN,
+                )
             # return True if successful
             return True
 